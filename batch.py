@@ -0,0 +1,209 @@
+"""
+Batch question answering over a PDF without the interactive agent loop.
+Reads questions from a text file (one per line, # for comments) and writes one JSON result per line.
+
+Usage:
+    python batch.py pdfs/CAB202LectureNotes.pdf questions.txt -o answers.jsonl --workers 4 --rpm 10
+
+Re-running with the same output file skips questions that already have a result for the same
+pdf, so an interrupted run can be resumed. The output keeps one record per question and pdf.
+"""
+
+import argparse
+import hashlib
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Optional
+
+import PyPDF2
+from dotenv import load_dotenv
+
+import search_strategy
+from ocr_queue import OCRQueue
+from utils import enable_llm_cache, generate_keywords, set_rate_limit
+
+
+def document_id(pdf_path: str) -> str:
+    """
+    Content hash of the pdf, so renaming a file keeps its results but a different pdf doesn't reuse them.
+    """
+    return hashlib.sha256(Path(pdf_path).read_bytes()).hexdigest()[:16]
+
+
+def question_id(document: str, question: str) -> str:
+    """
+    Stable id for a question about a document so results can be matched up when resuming.
+    """
+    return hashlib.sha256(f"{document}\n{question}".encode("utf-8")).hexdigest()[:16]
+
+
+def read_questions(question_path: Path) -> list[str]:
+    """
+    Load questions from a file, skipping blank lines, comments and duplicates.
+    """
+    questions = []
+    seen = set()
+    for line in question_path.read_text(encoding="utf-8").splitlines():
+        question = line.strip()
+        if not question or question.startswith("#") or question in seen:
+            continue
+        seen.add(question)
+        questions.append(question)
+    return questions
+
+
+def load_results(output_path: Path) -> dict[str, dict]:
+    """
+    Results from previous runs keyed by id, the last record for an id wins.
+    """
+    if not output_path.exists():
+        return {}
+
+    results = {}
+    for line in output_path.read_text(encoding="utf-8").splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue  # partial line from an interrupted write
+        if isinstance(record, dict) and "id" in record:
+            results[record["id"]] = record
+    return results
+
+
+def write_results(output_path: Path, results: dict[str, dict]) -> None:
+    """
+    Rewrite the output file with one record per id.
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = output_path.with_suffix(".tmp")
+    with open(tmp_file, "w", encoding="utf-8") as out:
+        for record in results.values():
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    tmp_file.replace(output_path)
+
+
+class BatchAnswerer:
+    """
+    Answers many questions against one PDF.
+    Page text (including OCR output) is extracted once and shared by every worker.
+    """
+
+    def __init__(self, pdf_path: str, max_pages: int = 50):
+        self.pdf_reader = PyPDF2.PdfReader(pdf_path)
+        self.ocr = OCRQueue(self.pdf_reader)
+        self.ocr.start()
+
+        # Same page limit as PDFAutomation.search_entire_document(), later pages are never OCR'd
+        pages_to_search = min(len(self.pdf_reader.pages), max_pages)
+        try:
+            self.ocr.wait(pages_to_search)
+            self.page_texts = [(page_num, self.ocr.page_text(page_num)) for page_num in range(pages_to_search)]
+        finally:
+            self.ocr.shutdown()
+
+    def answer(self, question: str) -> dict:
+        """
+        Run keyword generation and document search for one question.
+        """
+        start = time.perf_counter()
+        keywords = generate_keywords(question)
+        keywords_time = time.perf_counter() - start
+
+        candidate_pages = search_strategy.find_candidate_pages(self.page_texts, keywords)
+        result, page_numbers = search_strategy.search_candidate_pages(candidate_pages, question)
+        end = time.perf_counter()
+
+        return {
+            "answer": result.answer,
+            "reason": result.reason,
+            "pages": page_numbers,
+            "candidate_pages": [page_num for page_num, _, _ in candidate_pages[:20]],
+            "keywords": keywords,
+            "timings": {
+                "keywords_s": round(keywords_time, 3),
+                "search_s": round(end - start - keywords_time, 3),
+                "total_s": round(end - start, 3),
+            },
+        }
+
+
+def run_batch(pdf_path: str, question_path: str, output_path: str, workers: int = 4, rpm: Optional[float] = None) -> None:
+    """
+    Answer every unanswered question in question_path and add the results to output_path.
+    Questions that failed in an earlier run are retried and their error record replaced.
+    """
+    output_file = Path(output_path)
+    questions = read_questions(Path(question_path))
+    document = document_id(pdf_path)
+    results = load_results(output_file)
+    remaining = []
+    for question in questions:
+        record = results.get(question_id(document, question))
+        if record is None or "error" in record:
+            remaining.append(question)
+
+    print(f"{len(questions)} questions, {len(questions) - len(remaining)} already answered, {len(remaining)} to go")
+    if not remaining:
+        return
+
+    enable_llm_cache()
+    set_rate_limit(rpm)
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    try:
+        answerer = BatchAnswerer(pdf_path)
+        print(f"Loaded {pdf_path}: {answerer.ocr.status()}")
+
+        start = time.perf_counter()
+        finished = 0
+        queued = iter(remaining)
+
+        with open(output_file, "a", encoding="utf-8") as out:
+            # Only keep as many questions in flight as there are workers so an interrupt wastes at most that many calls
+            futures = {executor.submit(answerer.answer, q): q for _, q in zip(range(workers), queued)}
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    question = futures.pop(future)
+                    record = {"id": question_id(document, question), "document": pdf_path, "question": question}
+                    try:
+                        record.update(future.result())
+                    except Exception as e:
+                        record["error"] = str(e)
+
+                    # Flush each result so an interrupted run loses at most the in-flight questions
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    out.flush()
+
+                    finished += 1
+                    elapsed = time.perf_counter() - start
+                    print(f"[{finished}/{len(remaining)}] {finished / elapsed * 60:.1f} questions/min - {question[:60]}")
+
+                    next_question = next(queued, None)
+                    if next_question is not None:
+                        futures[executor.submit(answerer.answer, next_question)] = next_question
+    except KeyboardInterrupt:
+        print("Interrupted, run the same command again to resume")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        # Retried questions were appended after their old error record, keep only the latest
+        if output_file.exists():
+            write_results(output_file, load_results(output_file))
+
+
+if __name__ == "__main__":
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Answer a file of questions about a PDF and write the results as JSONL.")
+    parser.add_argument("pdf", help="path to the pdf document")
+    parser.add_argument("questions", help="text file with one question per line")
+    parser.add_argument("-o", "--output", default="extras/answers.jsonl", help="JSONL results file, one record per question, resumed from on rerun")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="number of questions answered concurrently")
+    parser.add_argument("--rpm", type=float, default=None, help="max model requests per minute (uncached calls only)")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    run_batch(args.pdf, args.questions, args.output, workers=args.workers, rpm=args.rpm)
@@ -0,0 +1,261 @@
+"""
+Background OCR for scanned PDF pages.
+Pages that contain images but little text are queued for a local Tesseract worker pool so the
+rest of the document stays searchable while the scanned pages are processed.
+"""
+
+import hashlib
+import io
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+try:
+    import pytesseract
+    from PIL import Image
+except ImportError:  # OCR is optional, text-only PDFs work without it
+    pytesseract = None
+    Image = None
+
+# Image pages with less text than this are treated as scanned. Scanned slides often keep a
+# small text layer (course header, page footer) so this sits well above a typical footer.
+MIN_PAGE_CHARS = 300
+CACHE_DIR = Path(__file__).parent / ".ocr_cache"
+
+
+def ocr_available() -> bool:
+    """
+    Check whether pytesseract, Pillow and the tesseract binary are all usable.
+    """
+    if pytesseract is None:
+        return False
+    try:
+        pytesseract.get_tesseract_version()
+        return True
+    except Exception:
+        return False
+
+
+def needs_ocr(text: Optional[str]) -> bool:
+    """
+    A page needs OCR when its text layer is empty or too short to be the page's real content.
+    """
+    return not text or len(text.strip()) < MIN_PAGE_CHARS
+
+
+def has_images(page) -> bool:
+    """
+    Check the page resources for image XObjects without decoding them.
+    Pages with short text and no images (e.g. title slides) have nothing to OCR.
+    """
+    resources = page.get("/Resources")
+    if resources is None:
+        return False
+    xobjects = resources.get_object().get("/XObject")
+    if xobjects is None:
+        return False
+    return any(xobject.get_object().get("/Subtype") == "/Image" for xobject in xobjects.get_object().values())
+
+
+def page_hash(page) -> str:
+    """
+    Hash the raw image and content streams of a page so OCR output can be cached across runs.
+    """
+    digest = hashlib.sha256()
+    contents = page.get_contents()
+    if contents is not None:
+        digest.update(contents.get_data())
+    for image in page.images:
+        digest.update(image.data)
+    return digest.hexdigest()
+
+
+class OCRQueue:
+    """
+    Owns text extraction for one PdfReader.
+    A scanner thread walks the document once, caching each page's text layer and
+    submitting low-text pages containing images to a CPU worker pool running Tesseract.
+    Results are cached on disk per page hash in .ocr_cache/.
+    Workers are daemon threads so exiting the agent never waits on a running OCR job.
+    """
+
+    def __init__(self, pdf_reader, max_workers: Optional[int] = None, cache_dir: Path = CACHE_DIR):
+        self.pdf_reader = pdf_reader
+        self.cache_dir = Path(cache_dir)
+        self.enabled = ocr_available()
+
+        # PdfReader is not thread safe, every page access goes through this lock
+        self._lock = threading.Lock()
+        # Notified whenever the scanner checks a page or a worker finishes one
+        self._progress = threading.Condition()
+        self._checked_pages = 0
+        self._scan_done = False
+
+        self._texts: Dict[int, str] = {}
+        self._ocr_texts: Dict[int, str] = {}
+        self._pending: Set[int] = set()
+        self._failed: Dict[int, str] = {}
+        self._scanned_pages: List[int] = []
+
+        self._jobs: "queue.Queue[Optional[int]]" = queue.Queue()
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"ocr-{i}", daemon=True)
+            for i in range(max_workers or max(1, (os.cpu_count() or 2) - 1))
+        ]
+        self._scanner = threading.Thread(target=self._scan_document, daemon=True)
+        self._closed = False
+
+    def start(self) -> None:
+        """
+        Begin scanning the document in the background. Returns immediately.
+        """
+        self._scanner.start()
+        if self.enabled:
+            for worker in self._workers:
+                worker.start()
+
+    def shutdown(self) -> None:
+        """
+        Stop the scanner and skip any OCR jobs that haven't started, used when a new PDF is loaded.
+        """
+        self._closed = True
+        # One sentinel per worker so idle threads exit instead of waiting on an abandoned queue
+        for _ in self._workers:
+            self._jobs.put(None)
+
+    def wait(self, page_limit: Optional[int] = None) -> None:
+        """
+        Block until pages below page_limit (default all pages) have been checked and OCR'd.
+        """
+        total_pages = len(self.pdf_reader.pages)
+        limit = total_pages if page_limit is None else min(page_limit, total_pages)
+
+        def finished() -> bool:
+            checked = self._checked_pages >= limit or self._scan_done
+            return checked and not any(page_num < limit for page_num in self._pending)
+
+        with self._progress:
+            self._progress.wait_for(finished)
+
+    def page_text(self, page_num: int) -> str:
+        """
+        Return the text layer for a page, followed by its OCR output once that is ready.
+        """
+        if page_num not in self._texts:
+            with self._lock:
+                self._texts[page_num] = self.pdf_reader.pages[page_num].extract_text() or ""
+        text = self._texts[page_num]
+
+        ocr_text = self._ocr_texts.get(page_num, "")
+        if not ocr_text.strip():
+            return text
+        if not text.strip():
+            return ocr_text
+        return f"{text}\n{ocr_text}"
+
+    def scanned_pages(self) -> List[int]:
+        """
+        Pages found so far that are images with little or no text layer.
+        """
+        return sorted(self._scanned_pages)
+
+    def is_scanning(self) -> bool:
+        """
+        True while the document is still being checked for scanned pages.
+        """
+        return not self._scan_done
+
+    def pending_pages(self) -> List[int]:
+        """
+        Pages that are queued or currently being OCR'd.
+        """
+        return sorted(self._pending.copy())
+
+    def status(self) -> str:
+        """
+        Summarise OCR progress for the loaded document.
+        """
+        scanned = self.scanned_pages()
+        if not scanned:
+            if self.is_scanning():
+                return "Checking pages for scanned content..."
+            return "All pages have a text layer, no OCR needed"
+        if not self.enabled:
+            return (f"{len(scanned)} page(s) are scanned {scanned} but OCR is unavailable. "
+                    "Install tesseract and pytesseract to read them.")
+
+        pending = self.pending_pages()
+        done = sorted(self._ocr_texts)
+        message = f"OCR complete for {len(done)} of {len(scanned)} scanned page(s)"
+        if pending:
+            message += f", still processing pages {pending}"
+        if self.is_scanning():
+            message += ", still checking the rest of the document"
+        if self._failed:
+            message += f", failed on pages {sorted(self._failed)}"
+        return message
+
+    def _scan_document(self) -> None:
+        try:
+            for page_num in range(len(self.pdf_reader.pages)):
+                if self._closed:
+                    return
+                if needs_ocr(self.page_text(page_num)):
+                    with self._lock:
+                        scanned = has_images(self.pdf_reader.pages[page_num])
+                    if scanned:
+                        self._scanned_pages.append(page_num)
+                        if self.enabled:
+                            with self._progress:
+                                self._pending.add(page_num)
+                            self._jobs.put(page_num)
+
+                with self._progress:
+                    self._checked_pages = page_num + 1
+                    self._progress.notify_all()
+        finally:
+            with self._progress:
+                self._scan_done = True
+                self._progress.notify_all()
+
+    def _worker(self) -> None:
+        while True:
+            page_num = self._jobs.get()
+            if page_num is None:
+                return
+            try:
+                # Jobs queued before a new PDF was loaded are dropped without running
+                if not self._closed:
+                    self._ocr_page(page_num)
+            finally:
+                with self._progress:
+                    self._pending.discard(page_num)
+                    self._progress.notify_all()
+
+    def _ocr_page(self, page_num: int) -> None:
+        try:
+            with self._lock:
+                page = self.pdf_reader.pages[page_num]
+                key = page_hash(page)
+                image_data = [image.data for image in page.images]
+
+            cache_file = self.cache_dir / f"{key}.txt"
+            if cache_file.exists():
+                self._ocr_texts[page_num] = cache_file.read_text(encoding="utf-8")
+                return
+
+            text_parts = []
+            for data in image_data:
+                if self._closed:
+                    return
+                with Image.open(io.BytesIO(data)) as image:
+                    text_parts.append(pytesseract.image_to_string(image))
+            text = "\n".join(part.strip() for part in text_parts if part.strip())
+
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(text, encoding="utf-8")
+            self._ocr_texts[page_num] = text
+        except Exception as e:
+            self._failed[page_num] = str(e)
@@ -3,6 +3,7 @@ from connectonion import xray, llm_do
 import search_strategy
 from pydantic import BaseModel
 from utils import generate_keywords
+from ocr_queue import OCRQueue
 
 class QuizContent(BaseModel):
     """Model for quiz output with separate questions and answers HTML."""
@@ -23,6 +24,7 @@ class PDFAutomation:
 
     def __init__(self):
         self.pdf_reader = None;
+        self.ocr = None;
         self.current_page = 0;
         self.page = None;
 
@@ -50,10 +52,45 @@ class PDFAutomation:
         try:
             self.pdf_reader = PyPDF2.PdfReader(pdf_path)
             self.current_page = 0
-            return "PDF successfully loaded"
         except Exception as e:
             return f"Invalid PDF filepath: {e}"
 
+        # Scanned pages are OCR'd in the background so the session isn't blocked
+        if self.ocr:
+            self.ocr.shutdown()
+        self.ocr = OCRQueue(self.pdf_reader)
+        self.ocr.start()
+        return "PDF successfully loaded"
+
+    def _page_text(self, page_num: int) -> str:
+        """
+        Text for a page, using OCR output for scanned pages once it is ready.
+        """
+        return self.ocr.page_text(page_num)
+
+    def _ocr_hint(self) -> str:
+        """
+        Explain why scanned pages may be missing from a search, or an empty string if none are.
+        """
+        pending = self.ocr.pending_pages()
+        if pending:
+            return f" Scanned pages {pending} are still being OCR'd, try again shortly."
+        scanned = self.ocr.scanned_pages()
+        if scanned and not self.ocr.enabled:
+            return f" Pages {scanned} are scanned but OCR is unavailable, install tesseract and pytesseract to search them."
+        if self.ocr.is_scanning():
+            return " The document is still being checked for scanned pages, try again shortly."
+        return ""
+
+    def get_ocr_status(self) -> str:
+        """
+        Tool: Check progress of background OCR on scanned pages in the loaded PDF.
+        Use when searches come back empty on a document with scanned slides or images.
+        """
+        if not self.ocr:
+            return "No PDF loaded. Call load_pdf() first."
+        return self.ocr.status()
+
 
     def get_page(self) -> str:
         """
@@ -90,7 +127,7 @@ class PDFAutomation:
         """
         if not self.page:
             return "No page loaded. Call get_page() first."
-        return self.page.extract_text()
+        return self._page_text(self.current_page)
 
     def generate_pdf_keywords(self) -> str:
         """
@@ -145,8 +182,7 @@ class PDFAutomation:
         
         text_parts = []
         for page_num in range(start_page, end_page + 1):
-            page = self.pdf_reader.pages[page_num]
-            text = page.extract_text()
+            text = self._page_text(page_num)
             text_parts.append(f"--- Page {page_num} ---\n{text}\n")
         
         ## update relevantPages if a html is going to be made
@@ -169,56 +205,20 @@ class PDFAutomation:
         original_page = self.current_page
         
         # Find pages with keywords first (cheap operation, no API calls)
-        candidate_pages = []
-        for page_num in range(pages_to_search):
-            page = self.pdf_reader.pages[page_num]
-            page_text = page.extract_text()
-            
-            # Check if multiple keywords are present (better signal, reduces false positives)
-            keyword_matches = sum(1 for kw in self.keywords if kw.lower() in page_text.lower())
-            if keyword_matches >= 2:  # Require at least 2 unique keyword matches
-                candidate_pages.append((page_num, page_text, keyword_matches))
+        page_texts = [(page_num, self._page_text(page_num)) for page_num in range(pages_to_search)]
+        candidate_pages = search_strategy.find_candidate_pages(page_texts, self.keywords)
         
         if not candidate_pages:
             self.current_page = original_page
             if original_page < total_pages:
                 self.page = self.pdf_reader.pages[original_page]
-            return "No answer found. No pages contained sufficient keywords."
-        
-        # Sort by keyword match count (highest first) - search best matches first
-        candidate_pages.sort(key=lambda x: x[2], reverse=True)
+            return "No answer found. No pages contained sufficient keywords." + self._ocr_hint()
         
         # Process pages in batches of 5 to reduce API calls (5 pages per call instead of 1)
-        batch_size = 5
-        for batch_start in range(0, min(len(candidate_pages), 20), batch_size):  # Max 20 pages = 4 API calls
-            batch = candidate_pages[batch_start:batch_start + batch_size]
-            
-            # Build batch prompt with multiple pages
-            batch_text = ""
-            page_numbers = []
-            for page_num, page_text, _ in batch:
-                # Truncate very long pages to reduce tokens (keep first 2000 chars)
-                truncated_text = page_text[:2000] + "..." if len(page_text) > 2000 else page_text
-                batch_text += f"\n\n--- Page {page_num} ---\n{truncated_text}"
-                page_numbers.append(page_num)
-            
-            # Single API call for the entire batch (5 pages at once!)
-            result = llm_do(f"""
-            Search the following pages for an answer to the question: {self.question}
-
-            Pages to search:
-            {batch_text}
-
-            If you find a satisfactory answer, provide it. If the answer is unsatisfactory or lacking enough context, return:
-            answer="No answer found on these pages", reason="Insufficient information"
-            """, 
-            output=search_strategy.SearchStrategy, model="gemini-2.5-flash")
-            
-            if result.answer != "No answer found on these pages" and result.answer != "No answer found on the page":
-                self.relevantPages = page_numbers # Save the Relevant Pages
-                answers.append(f"Found in pages {page_numbers}: {result.answer}")
-                # Early stopping - found a good answer!
-                break
+        result, page_numbers = search_strategy.search_candidate_pages(candidate_pages, self.question)
+        if page_numbers:
+            self.relevantPages = page_numbers # Save the Relevant Pages
+            answers.append(f"Found in pages {page_numbers}: {result.answer}")
         
         # Restore original page position
         self.current_page = original_page
@@ -228,7 +228,7 @@ class PDFAutomation:
         if answers:
             return "\n\n".join(answers)
         else:
-            return "No answer found in the searched pages."
+            return "No answer found in the searched pages." + self._ocr_hint()
 
     def get_page_number(self) -> int:
         """
@@ -250,8 +250,7 @@ class PDFAutomation:
         # Extract text from relevant pages
         pages_text = ""
         for page_num in self.relevantPages:
-            page = self.pdf_reader.pages[page_num]
-            page_text = page.extract_text()
+            page_text = self._page_text(page_num)
             pages_text += f"\n\n--- Page {page_num} ---\n{page_text}"
         
         # Generate HTML notes using LLM
@@ -289,8 +288,7 @@ class PDFAutomation:
         # Extract text from relevant pages
         pages_text = ""
         for page_num in self.relevantPages:
-            page = self.pdf_reader.pages[page_num]
-            page_text = page.extract_text()
+            page_text = self._page_text(page_num)
             pages_text += f"\n\n--- Page {page_num} ---\n{page_text}"
 
         # Generate quiz HTML using LLM with structured output
@@ -1,10 +1,19 @@
 from connectonion import xray, llm_do
 from pydantic import BaseModel
+from utils import cached_llm_do
 
 class SearchStrategy(BaseModel):
     answer: str
     reason: str
 
+NO_ANSWERS = ("No answer found on these pages", "No answer found on the page")
+
+def found_answer(result: SearchStrategy) -> bool:
+    """
+    True if the llm returned an actual answer rather than one of the no answer replies.
+    """
+    return result.answer not in NO_ANSWERS
+
 def search_page(page: str, 
     keywords: list[str],
     question: str) -> SearchStrategy:
@@ -46,4 +55,57 @@ answer="No answer found on the page", reason="Insufficient information on this p
 """, output=SearchStrategy, model="gemini-2.5-flash")
         return answer
     
-    return SearchStrategy(answer="No answer found on the page", reason=f"Only {keyword_matches} keyword(s) found, need at least 2")
\ No newline at end of file
+    return SearchStrategy(answer="No answer found on the page", reason=f"Only {keyword_matches} keyword(s) found, need at least 2")
+
+
+def find_candidate_pages(page_texts: list[tuple[int, str]], keywords: list[str]) -> list[tuple[int, str, int]]:
+    """
+    Find pages with at least 2 unique keyword matches (cheap operation, no API calls).
+    Returns (page_num, page_text, keyword_matches) sorted best match first.
+    """
+    candidate_pages = []
+    for page_num, page_text in page_texts:
+        # Check if multiple keywords are present (better signal, reduces false positives)
+        keyword_matches = sum(1 for kw in keywords if kw.lower() in page_text.lower())
+        if keyword_matches >= 2:  # Require at least 2 unique keyword matches
+            candidate_pages.append((page_num, page_text, keyword_matches))
+
+    # Sort by keyword match count (highest first) - search best matches first
+    candidate_pages.sort(key=lambda x: x[2], reverse=True)
+    return candidate_pages
+
+
+def search_candidate_pages(candidate_pages: list[tuple[int, str, int]], question: str) -> tuple[SearchStrategy, list[int]]:
+    """
+    Ask the LLM about candidate pages in batches of 5 and stop at the first satisfactory answer.
+    Returns the answer and the pages it was found in, or an empty page list if nothing was found.
+    """
+    batch_size = 5
+    for batch_start in range(0, min(len(candidate_pages), 20), batch_size):  # Max 20 pages = 4 API calls
+        batch = candidate_pages[batch_start:batch_start + batch_size]
+
+        # Build batch prompt with multiple pages
+        batch_text = ""
+        page_numbers = []
+        for page_num, page_text, _ in batch:
+            # Truncate very long pages to reduce tokens (keep first 2000 chars)
+            truncated_text = page_text[:2000] + "..." if len(page_text) > 2000 else page_text
+            batch_text += f"\n\n--- Page {page_num} ---\n{truncated_text}"
+            page_numbers.append(page_num)
+
+        # Single API call for the entire batch (5 pages at once!)
+        result = cached_llm_do(f"""
+            Search the following pages for an answer to the question: {question}
+
+            Pages to search:
+            {batch_text}
+
+            If you find a satisfactory answer, provide it. If the answer is unsatisfactory or lacking enough context, return:
+            answer="No answer found on these pages", reason="Insufficient information"
+            """,
+            output=SearchStrategy, model="gemini-2.5-flash", should_cache=found_answer)
+
+        if found_answer(result):
+            return result, page_numbers
+
+    return SearchStrategy(answer="No answer found on these pages", reason="Insufficient information"), []
@@ -2,9 +2,82 @@
 Shared helpers for study agent flows.
 """
 
-from typing import List, Optional
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, List, Optional
 from connectonion import llm_do
 
+LLM_CACHE_DIR = Path(__file__).parent / ".llm_cache"
+
+_cache_enabled = False
+_rate_lock = threading.Lock()
+_min_call_interval = 0.0
+_last_call_time = 0.0
+
+
+def enable_llm_cache(enabled: bool = True) -> None:
+    """
+    Turn the on-disk llm_do cache on or off. Off by default so the interactive agent always asks the model.
+    Delete the .llm_cache/ folder to clear cached responses.
+    """
+    global _cache_enabled
+    _cache_enabled = enabled
+
+
+def set_rate_limit(requests_per_minute: Optional[float]) -> None:
+    """
+    Space out uncached llm_do calls so they stay under the model's requests-per-minute quota.
+    Pass None to remove the limit.
+    """
+    global _min_call_interval
+    _min_call_interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+
+
+def _wait_for_rate_limit() -> None:
+    global _last_call_time
+    with _rate_lock:
+        delay = _last_call_time + _min_call_interval - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        _last_call_time = time.monotonic()
+
+
+def cached_llm_do(prompt: str, *, model: str = "gemini-2.5-flash", output=None,
+                  should_cache: Optional[Callable[[Any], bool]] = None):
+    """
+    llm_do with an optional on-disk cache in .llm_cache/ keyed by model, prompt and output schema.
+    Only used once enable_llm_cache() has been called. Empty responses, and any response
+    rejected by should_cache, are never stored so a bad reply isn't reused on later runs.
+    """
+    schema = output.__name__ if output else "str"
+    key = hashlib.sha256(f"{model}\n{schema}\n{prompt}".encode("utf-8")).hexdigest()
+    cache_file = LLM_CACHE_DIR / f"{key}.json"
+
+    if _cache_enabled and cache_file.exists():
+        cached = cache_file.read_text(encoding="utf-8")
+        return output.model_validate_json(cached) if output else json.loads(cached)
+
+    _wait_for_rate_limit()
+    if output:
+        result = llm_do(prompt, output=output, model=model)
+        serialized = result.model_dump_json()
+    else:
+        result = llm_do(prompt, model=model)
+        serialized = json.dumps(result)
+
+    if not _cache_enabled or not result or (should_cache and not should_cache(result)):
+        return result
+
+    LLM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # Write then rename so concurrent workers never read a half written file
+    tmp_file = cache_file.with_suffix(f".{threading.get_ident()}.tmp")
+    tmp_file.write_text(serialized, encoding="utf-8")
+    tmp_file.replace(cache_file)
+    return result
+
 
 def generate_keywords(question: str, *, model: str = "gemini-2.5-flash") -> List[str]:
     """
@@ -14,7 +87,7 @@ def generate_keywords(question: str, *, model: str = "gemini-2.5-flash") -> List
     if not question:
         return []
 
-    keywords_str: Optional[str] = llm_do(
+    keywords_str: Optional[str] = cached_llm_do(
         f"""  
         Generate a comprehensive set of keywords based on the question: {question}.
         